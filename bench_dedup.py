@@ -0,0 +1,119 @@
+"""
+Throughput benchmark for the resume dedup stage.
+
+Generates synthetic resumes, each starting with a candidate's name, email and phone number.
+A configurable share of uploads are re-uploads of another candidate's resume in the batch:
+exact copies (reformatted whitespace/case) and near-duplicates with small edits. Another share
+are different candidates filling in the same template: mostly identical text, but their own
+contact details, so they must not be merged. Reports resumes/second and pairwise
+precision/recall of the clustering.
+
+Usage:
+    python bench_dedup.py --batch-sizes 50 200 1000 --dup-rate 0.2 --template-rate 0.2
+"""
+import argparse
+import random
+import time
+from itertools import combinations
+from src.dedup import DuplicateDetector
+
+
+def make_body(rng, vocabulary, words=600):
+  lines = []
+  for _ in range(words // 12):
+    lines.append(" ".join(rng.choice(vocabulary) for _ in range(12)))
+  return "\n".join(lines)
+
+
+def make_contact(rng, candidate):
+  phone = f"+1 {rng.randint(200, 999)} {rng.randint(200, 999)} {rng.randint(1000, 9999)}"
+  return f"Candidate {candidate}\ncandidate{candidate}@example.com | {phone}\n"
+
+
+def make_near_duplicate(rng, body, vocabulary, edit_rate=0.02):
+  words = body.split(" ")
+  for i in range(len(words)):
+    if rng.random() < edit_rate:
+      words[i] = rng.choice(vocabulary)
+  return " ".join(words)
+
+
+def make_batch(rng, vocabulary, size, dup_rate, template_rate, num_templates=5):
+  """
+  Returns a list of (filename, text) pairs and the ground-truth cluster id of each
+  (one cluster per candidate).
+  """
+  templates = [make_body(rng, vocabulary) for _ in range(num_templates)]
+  resumes = []
+  cluster_of = []
+  originals = []
+  for i in range(size):
+    draw = rng.random()
+    if originals and draw < dup_rate:
+      # The same candidate uploads their resume again
+      cluster, contact, body = rng.choice(originals)
+      if rng.random() < 0.5:
+        text = (contact + body).upper().replace("\n", "  \n ")  # exact copy after normalization
+      else:
+        text = contact + make_near_duplicate(rng, body, vocabulary)
+    else:
+      cluster = len(originals)
+      contact = make_contact(rng, cluster)
+      if draw < dup_rate + template_rate:
+        # A new candidate filling in a shared template with a few edits of their own
+        body = make_near_duplicate(rng, rng.choice(templates), vocabulary, edit_rate=0.05)
+      else:
+        body = make_body(rng, vocabulary)
+      originals.append((cluster, contact, body))
+      text = contact + body
+    resumes.append((f"resume_{i}.pdf", text))
+    cluster_of.append(cluster)
+  return resumes, cluster_of
+
+
+def pair_scores(resumes, cluster_of, representatives, groups):
+  predicted = {filename: filename for filename, _ in representatives}
+  for group in groups:
+    for filename in group["duplicates"]:
+      predicted[filename] = group["representative"]
+
+  filenames = [filename for filename, _ in resumes]
+  truth_pairs = {(a, b) for (i, a), (j, b) in combinations(enumerate(filenames), 2) if cluster_of[i] == cluster_of[j]}
+  predicted_pairs = {(a, b) for a, b in combinations(filenames, 2) if predicted[a] == predicted[b]}
+
+  true_positives = len(truth_pairs & predicted_pairs)
+  precision = true_positives / len(predicted_pairs) if predicted_pairs else 1.0
+  recall = true_positives / len(truth_pairs) if truth_pairs else 1.0
+  return precision, recall
+
+
+def main():
+  arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  arg_parser.add_argument("--batch-sizes", type=int, nargs="+", default=[50, 200, 1000])
+  arg_parser.add_argument("--dup-rate", type=float, default=0.2, help="Share of uploads that copy another resume")
+  arg_parser.add_argument("--template-rate", type=float, default=0.2,
+                          help="Share of uploads from new candidates using a shared template")
+  arg_parser.add_argument("--seed", type=int, default=0)
+  args = arg_parser.parse_args()
+
+  rng = random.Random(args.seed)
+  vocabulary = [f"word{i}" for i in range(5000)]
+
+  for size in args.batch_sizes:
+    resumes, cluster_of = make_batch(rng, vocabulary, size, args.dup_rate, args.template_rate)
+
+    detector = DuplicateDetector()
+    start = time.perf_counter()
+    representatives, groups = detector.group(resumes)
+    elapsed = time.perf_counter() - start
+
+    precision, recall = pair_scores(resumes, cluster_of, representatives, groups)
+    print(
+      f"batch={size:<5} unique={len(representatives):<5} groups={len(groups):<4} "
+      f"time={elapsed * 1000:8.1f} ms  throughput={size / elapsed:8.1f} resumes/s  "
+      f"precision={precision:.3f} recall={recall:.3f}"
+    )
+
+
+if __name__ == "__main__":
+  main()
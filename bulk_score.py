@@ -0,0 +1,177 @@
+"""
+Offline bulk scoring of a directory of PDF resumes against a job description.
+
+Walks the resume directory, scores each PDF in a multiprocessing pool with the same
+ResumeParser + SimilarityMatch pipeline as /api/match (optionally adding an LLM score),
+and streams one row per resume to a JSONL or CSV file. Successfully scored files are recorded
+in a checkpoint file (as paths relative to --resumes), so re-running the same command resumes an
+interrupted run. Files that failed (e.g. an LLM rate limit or timeout) are logged to
+<output>.errors.jsonl and not checkpointed, so they are retried on the next run.
+
+Usage:
+    python bulk_score.py --resumes archive/ --job job.txt --output scores.jsonl
+    python bulk_score.py --resumes archive/ --job job.txt --output scores.csv --workers 8 --llm
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from multiprocessing import Pool
+import fitz
+from src.resume_parser import ResumeParser
+from src.jd_parser import JobDescriptionParser
+from src.similarity_match import SimilarityMatch, DEFAULT_WEIGHTS
+from src.ranking import combine_scores
+from src.llm_matcher import score_resume_with_llm
+
+FIELDS = ["path", "filename", "candidateName", "score", "skills", "experience", "overall", "llmScore"]
+
+# Per-worker state set up once by init_worker
+_resume_dir = None
+_job_text = None
+_jd_parsed = None
+_api_key = None
+
+
+def extract_text_from_pdf(path):
+  doc = fitz.open(path)
+  text = ""
+  for page in doc:
+    text += page.get_text()
+
+  return text
+
+
+def find_resumes(directory):
+  """
+  Returns the sorted paths, relative to directory, of all PDF files under it (recursively).
+  Relative paths keep the checkpoint valid however the directory is spelled (./archive, absolute, ...).
+  """
+  paths = []
+  for root, _, files in os.walk(directory):
+    for name in files:
+      if name.lower().endswith('.pdf'):
+        paths.append(os.path.relpath(os.path.join(root, name), directory))
+  return sorted(paths)
+
+
+def init_worker(resume_dir, job_text, api_key):
+  # Parse the job description once per worker instead of once per resume
+  global _resume_dir, _job_text, _jd_parsed, _api_key
+  _resume_dir = resume_dir
+  _job_text = job_text
+  _jd_parsed = JobDescriptionParser(job_text).parse_jd_data()
+  _api_key = api_key
+
+
+def score_file(path):
+  """
+  Scores a single resume, given its path relative to the resume directory. Errors are
+  reported in the row rather than raised so one bad PDF does not stop the run.
+  """
+  row = {"path": path, "filename": os.path.basename(path)}
+  try:
+    resume_text = extract_text_from_pdf(os.path.join(_resume_dir, path))
+    resume_parsed = ResumeParser(resume_text).parse(_jd_parsed['experience_required'])
+    components = SimilarityMatch(resume_parsed, _jd_parsed).component_scores()
+
+    row["candidateName"] = resume_parsed['name']
+    row["score"] = round(combine_scores(components, DEFAULT_WEIGHTS), 4)
+    row.update({name: round(value, 4) for name, value in components.items()})
+
+    if _api_key:
+      response = json.loads(score_resume_with_llm(resume_text, _job_text, _api_key))
+      row["llmScore"] = round(float(response["score"]), 4)
+  except Exception as e:
+    row["error"] = str(e)
+  return row
+
+
+def load_checkpoint(path):
+  if not os.path.exists(path):
+    return set()
+  with open(path, 'r', encoding='utf8') as f:
+    return {line.rstrip('\n') for line in f if line.strip()}
+
+
+def format_duration(seconds):
+  minutes, seconds = divmod(int(seconds), 60)
+  hours, minutes = divmod(minutes, 60)
+  return f"{hours:d}:{minutes:02d}:{seconds:02d}"
+
+
+def main():
+  arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  arg_parser.add_argument("--resumes", required=True, help="Directory of PDF resumes (searched recursively)")
+  arg_parser.add_argument("--job", required=True, help="Text file with the job description")
+  arg_parser.add_argument("--output", required=True, help="Output file; .csv writes CSV, anything else JSONL")
+  arg_parser.add_argument("--checkpoint", help="Checkpoint file (default: <output>.checkpoint)")
+  arg_parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Number of worker processes")
+  arg_parser.add_argument("--llm", action="store_true", help="Also score each resume with the LLM")
+  arg_parser.add_argument("--api-key", default=os.environ.get("OPENAI_API_KEY"), help="OpenAI API key for --llm")
+  args = arg_parser.parse_args()
+
+  if args.llm and not args.api_key:
+    arg_parser.error("--llm requires --api-key or OPENAI_API_KEY")
+
+  with open(args.job, encoding="utf8") as f:
+    job_text = f.read()
+
+  checkpoint_path = args.checkpoint or args.output + ".checkpoint"
+  errors_path = args.output + ".errors.jsonl"
+  done = load_checkpoint(checkpoint_path)
+  paths = [path for path in find_resumes(args.resumes) if path not in done]
+  print(f"{len(done)} resumes already scored, {len(paths)} remaining", file=sys.stderr)
+  if not paths:
+    return
+
+  as_csv = args.output.lower().endswith('.csv')
+  write_header = as_csv and (not os.path.exists(args.output) or os.path.getsize(args.output) == 0)
+
+  with open(args.output, 'a', encoding='utf8', newline='') as output, \
+       open(checkpoint_path, 'a', encoding='utf8') as checkpoint, \
+       open(errors_path, 'a', encoding='utf8') as error_log, \
+       Pool(args.workers, initializer=init_worker,
+            initargs=(args.resumes, job_text, args.api_key if args.llm else None)) as pool:
+
+    writer = csv.DictWriter(output, fieldnames=FIELDS) if as_csv else None
+    if write_header:
+      writer.writeheader()
+
+    start = time.time()
+    errors = 0
+    for count, row in enumerate(pool.imap_unordered(score_file, paths), start=1):
+      if "error" in row:
+        # Failed files are logged but not checkpointed, so the next run retries them
+        error_log.write(json.dumps(row) + "\n")
+        error_log.flush()
+        errors += 1
+      else:
+        if as_csv:
+          writer.writerow(row)
+        else:
+          output.write(json.dumps(row) + "\n")
+        output.flush()
+
+        # Only checkpoint a file once its row has been written
+        checkpoint.write(row["path"] + "\n")
+        checkpoint.flush()
+
+      elapsed = time.time() - start
+      rate = count / elapsed
+      eta = (len(paths) - count) / rate if rate else 0
+      print(
+        f"\r{count}/{len(paths)} processed  {rate:.2f} resumes/s  elapsed {format_duration(elapsed)}  "
+        f"ETA {format_duration(eta)}  errors {errors}",
+        end="", file=sys.stderr, flush=True
+      )
+
+  print(file=sys.stderr)
+  if errors:
+    print(f"{errors} resumes failed (see {errors_path}); re-run the same command to retry them", file=sys.stderr)
+
+
+if __name__ == "__main__":
+  main()
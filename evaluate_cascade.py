@@ -0,0 +1,104 @@
+"""
+Offline evaluation of the two-stage cascade against LLM-only scoring.
+
+Scores every resume in a directory with the LLM (the reference ranking) and with the
+embedding pipeline, then builds the cascade ranking for one or more top_k values and
+reports how closely it agrees with the LLM-only ranking. As in /api/match_cascade, the
+LLM-scored candidates are ranked as a block ahead of the embedding-only ones.
+
+Usage:
+    python evaluate_cascade.py --resumes data/resumes --job job.txt --top-k 3 5 10
+"""
+import argparse
+import os
+import fitz
+from scipy.stats import kendalltau, spearmanr
+from src.jd_parser import JobDescriptionParser
+from src.cascade import embedding_stage, select_for_llm, llm_score_and_name, DEFAULT_MIN_SCORE
+
+
+def extract_text_from_pdf(path):
+  doc = fitz.open(path)
+  text = ""
+  for page in doc:
+    text += page.get_text()
+
+  return text
+
+
+def rank_agreement(reference, candidate, k):
+  """
+  Compares two {filename: score} rankings over the same files.
+
+  Returns:
+      dict: Spearman rho, Kendall tau and the overlap of the top-k filenames.
+  """
+  filenames = sorted(reference)
+  ref_scores = [reference[f] for f in filenames]
+  cand_scores = [candidate[f] for f in filenames]
+
+  ref_top = set(sorted(reference, key=reference.get, reverse=True)[:k])
+  cand_top = set(sorted(candidate, key=candidate.get, reverse=True)[:k])
+
+  return {
+    "spearman": spearmanr(ref_scores, cand_scores)[0],
+    "kendall": kendalltau(ref_scores, cand_scores)[0],
+    "top_k_overlap": len(ref_top & cand_top) / max(len(ref_top), 1)
+  }
+
+
+def main():
+  arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  arg_parser.add_argument("--resumes", required=True, help="Directory of PDF resumes")
+  arg_parser.add_argument("--job", required=True, help="Text file with the job description")
+  arg_parser.add_argument("--api-key", default=os.environ.get("OPENAI_API_KEY"), help="OpenAI API key")
+  arg_parser.add_argument("--top-k", type=int, nargs="+", default=[3, 5, 10], help="top_k values to evaluate")
+  arg_parser.add_argument("--min-score", type=float, default=DEFAULT_MIN_SCORE, help="Embedding score floor")
+  args = arg_parser.parse_args()
+
+  with open(args.job, encoding="utf8") as f:
+    job_text = f.read()
+
+  resumes = []
+  for filename in sorted(os.listdir(args.resumes)):
+    if filename.endswith(".pdf"):
+      resumes.append((filename, extract_text_from_pdf(os.path.join(args.resumes, filename))))
+
+  jd_parsed = JobDescriptionParser(job_text).parse_jd_data()
+  scored = embedding_stage(resumes, jd_parsed)
+
+  # Reference ranking: every resume scored by the LLM. These scores are reused as the
+  # stage-two scores below so each configuration costs no extra LLM calls.
+  llm_scores = {}
+  for candidate in scored:
+    try:
+      llm_scores[candidate["filename"]] = llm_score_and_name(candidate["resume_text"], job_text, args.api_key)[0]
+    except Exception as e:
+      print(f"LLM scoring failed for {candidate['filename']}: {e}")
+
+  scored = [candidate for candidate in scored if candidate["filename"] in llm_scores]
+  embedding_scores = {candidate["filename"]: candidate["embeddingScore"] for candidate in scored}
+  print(f"Evaluated {len(scored)} resumes")
+
+  for top_k in args.top_k:
+    selected = select_for_llm(scored, top_k, args.min_score)
+    cascade_scores = {
+      filename: llm_scores[filename] if filename in selected else score
+      for filename, score in embedding_scores.items()
+    }
+
+    # As in the API, LLM-scored candidates rank as a block ahead of embedding-only ones,
+    # so compare positions in that order rather than the mixed-scale scores
+    cascade_order = sorted(cascade_scores, key=lambda f: (f in selected, cascade_scores[f]))
+    cascade_ranks = {filename: position for position, filename in enumerate(cascade_order)}
+
+    agreement = rank_agreement(llm_scores, cascade_ranks, top_k)
+    print(
+      f"top_k={top_k:<3} llm_calls={len(selected):<4} avoided={len(scored) - len(selected):<4} "
+      f"spearman={agreement['spearman']:.3f} kendall={agreement['kendall']:.3f} "
+      f"top_k_overlap={agreement['top_k_overlap']:.2f}"
+    )
+
+
+if __name__ == "__main__":
+  main()
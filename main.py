@@ -2,11 +2,15 @@ from flask import Flask, request, jsonify, send_file
 from flask_cors import CORS, cross_origin
 from src.resume_parser import ResumeParser
 from src.jd_parser import JobDescriptionParser
-from src.similarity_match import SimilarityMatch
+from src.similarity_match import SimilarityMatch, DEFAULT_WEIGHTS
+from src.ranking import rank_entries, DEFAULT_THRESHOLD
 from zipfile import ZipFile
 import json
+import math
 from io import BytesIO
 from src.llm_matcher import score_resume_with_llm
+from src.cascade import run_cascade, get_cascade_metrics, DEFAULT_TOP_K, DEFAULT_MIN_SCORE
+from src.dedup import DuplicateDetector, ScoreCache
 import fitz
 import logging
 logging.basicConfig(level=logging.DEBUG)
@@ -14,6 +18,19 @@ logging.basicConfig(level=logging.DEBUG)
 app = Flask(__name__)
 CORS(app, origins=["https://fitmyresume.netlify.app", "http://localhost:3000"], supports_credentials=True)
 
+# LLM scoring produces a single component, so it is weighted as-is
+LLM_WEIGHTS = {"llm": 1.0}
+
+# Cascade results are ranked on their final (embedding or LLM) score; the embedding components
+# are returned with weight 0 so /api/rerank can blend them in
+CASCADE_WEIGHTS = {"cascade": 1.0, "skills": 0.0, "experience": 0.0, "overall": 0.0}
+
+# Exact/near-duplicate detection within each uploaded batch
+duplicate_detector = DuplicateDetector()
+
+# Scores of resumes already seen with the same job description in earlier uploads
+score_cache = ScoreCache()
+
 
 def extract_text_from_pdf(file_stream):
   # Open the PDF file from a binary stream using PyMuPDF (fitz)
@@ -27,6 +44,28 @@ def extract_text_from_pdf(file_stream):
   return text
 
 
+def extract_unique_resumes(resume_files):
+  """
+    Extracts text from the uploaded PDFs and collapses exact and near-duplicate copies.
+
+    Returns:
+        - A list of (filename, resume_text) pairs, one representative per duplicate cluster.
+        - A list of duplicate groupings to return in the response.
+  """
+  resumes = []
+  for file in resume_files:
+    # Skip files that are not PDFs
+    if not file.filename.endswith('.pdf'):
+      continue
+
+    try:
+      resumes.append((file.filename, extract_text_from_pdf(file)))
+    except Exception as e:
+      print(f"Error processing {file.filename}: {e}")
+
+  return duplicate_detector.group(resumes)
+
+
 @app.route('/')
 def index():
     app.logger.info("Hit the index route")
@@ -48,7 +87,10 @@ def match():
             - filename
             - candidate name
             - similarity score (rounded)
+            - per-component scores ('skills', 'experience', 'overall')
         - Only resumes with a similarity score >= 0.5 are included.
+        - 'weights' the scores were combined with; pass them back to /api/rerank as 'baseWeights'.
+        - 'duplicates': groups of exact/near-duplicate uploads; only the representative is scored.
   """
   # print("in match function")
   # Get the uploaded resume files from the request (multiple files allowed)
@@ -64,60 +106,56 @@ def match():
       return jsonify({'error': 'Missing file or job description'}), 400
 
 
+  # Keep the raw job description: cached scores are keyed by it
+  job_description = job_text
+
   # Parse the job description using JobDescriptionParser
   job_text = JobDescriptionParser(job_text).parse_jd_data()
 
   if 'experience_required' not in job_text:
     return jsonify({'error': 'Job description parsing failed'}), 500
 
-  results = []
-  lessScore = []
-  # Iterate over each uploaded file
-  for file in resume_files:
-    # print(f"Processing file: {file.filename}")
-    # Skip files that are not PDFs    
-    if not file.filename.endswith('.pdf'):
-      continue 
+  # Extract raw text from the PDF resumes and drop duplicate copies
+  resumes, duplicates = extract_unique_resumes(resume_files)
 
-    try:
-      # Extract raw text from the PDF resume
-      resume_text = extract_text_from_pdf(file)
+  entries = []
+  # Iterate over each unique resume
+  for filename, resume_text in resumes:
+    # Reuse the scores if the same resume was scored against this job in an earlier upload
+    cached = score_cache.get(resume_text, job_description)
+    if cached is not None:
+      entries.append({"filename": filename, **cached})
+      continue
 
+    try:
       # print(f"Extracted resume text length: {len(resume_text)}")
       # Parse the extracted resume text using ResumeParser
       resume_parsed = ResumeParser(resume_text).parse(job_text['experience_required'])
       # print("Parsed resume:", resume_parsed)
 
       # print("Calculating similarity for:", file.filename)
-      # Calculate similarity score between parsed resume and job description
-      score = SimilarityMatch(resume_parsed, job_text).similarity_check_in_resume_and_job_desc()
-      # print("Score for", file.filename, ":", score)
-
-      # If the similarity score is above threshold (e.g., 0.5), add it to the results
-      if score>=0.5:
-        results.append({
-          "filename": file.filename,
-          "candidateName": resume_parsed['name'],
-          "score": round(score, 2)
-        })
-
-      if score < 0.5:
-        lessScore.append({
-          "filename": file.filename,
-          "candidateName": resume_parsed['name'],
-          "score": round(score, 2)
-        })
+      # Calculate component similarity scores between parsed resume and job description
+      components = SimilarityMatch(resume_parsed, job_text).component_scores()
+      # print("Scores for", filename, ":", components)
+      score_cache.put(resume_text, job_description, resume_parsed['name'], components)
+
+      entries.append({
+        "filename": filename,
+        "candidateName": resume_parsed['name'],
+        "components": components
+      })
 
     except Exception as e:
-      print(f"Error processing {file.filename}: {e}")
+      print(f"Error processing {filename}: {e}")
 
-  # Sort results in descending order based on similarity score    
-  results = sorted(results, key=lambda x: x['score'], reverse=True)
-  lessScore = sorted(lessScore, key=lambda x: x['score'], reverse=True)
+  # Split on the threshold (e.g., 0.5) and sort in descending order based on similarity score
+  results, lessScore = rank_entries(entries, DEFAULT_WEIGHTS, DEFAULT_THRESHOLD)
   
-  # Return the results as a JSON response
-  return jsonify({"results": results,
-                  "lessScore": lessScore})
+  # Return the results as a JSON response, with the weights they were ranked with for /api/rerank
+  return jsonify({"weights": DEFAULT_WEIGHTS,
+                  "results": results,
+                  "lessScore": lessScore,
+                  "duplicates": duplicates})
   
 
 
@@ -138,6 +176,8 @@ def match_using_llm():
             - candidate name (extracted by LLM)
             - similarity score (>= 0.5 only)
         - Results are sorted by score in descending order.
+        - 'weights' the scores were combined with; pass them back to /api/rerank as 'baseWeights'.
+        - 'duplicates': groups of exact/near-duplicate uploads; only the representative is sent to the LLM.
   """
 
   # Get uploaded resume files and job description from the request
@@ -151,18 +191,13 @@ def match_using_llm():
 
 
   
-  results = []
-  lessScore = []
-  # Process each uploaded resume file
-  for file in resume_files:
-    # Skip files that are not PDFs    
-    if not file.filename.endswith('.pdf'):
-      continue  
+  # Extract text from the resume PDFs and drop duplicate copies
+  resumes, duplicates = extract_unique_resumes(resume_files)
 
+  entries = []
+  # Process each unique resume
+  for filename, resume_text in resumes:
     try:
-      # Extract text from the resume PDF
-      resume_text = extract_text_from_pdf(file)
-      
       # Call LLM-based scoring function with resume, job description, and API key
       score_response = score_resume_with_llm(resume_text, job_text , api_key)
       
@@ -173,29 +208,168 @@ def match_using_llm():
       # Convert score to float
       score = float(responseScore["score"])
       
-      # Include in results if score meets threshold
-      if score >= 0.5:
-        results.append({
-          "filename": file.filename,
-          "candidateName": responseScore['Candidate Name'],
-          "score": round(score,2)
-        })
-
-      if score < 0.5:
-        lessScore.append({
-          "filename": file.filename,
-          "candidateName":  responseScore['Candidate Name'],
-          "score": round(score, 2)
-        })
+      entries.append({
+        "filename": filename,
+        "candidateName": responseScore['Candidate Name'],
+        "components": {"llm": score}
+      })
 
     except Exception as e:
-      print(f"Error processing {file.filename}: {e}")
+      print(f"Error processing {filename}: {e}")
 
-  # Sort the results by score in descending order
-  results = sorted(results, key=lambda x: x['score'], reverse=True)
-  lessScore = sorted(lessScore, key=lambda x: x['score'], reverse=True)
+  # Split on the threshold and sort the results by score in descending order
+  results, lessScore = rank_entries(entries, LLM_WEIGHTS, DEFAULT_THRESHOLD)
   # Return the results as a JSON response
-  return jsonify({"results": results,
+  return jsonify({"weights": LLM_WEIGHTS,
+                  "results": results,
+                  "lessScore": lessScore,
+                  "duplicates": duplicates})
+
+
+@app.route('/api/match_cascade', methods=['POST'])
+def match_using_cascade():
+  """
+    API endpoint to match resumes with a two-stage cascade: every resume is scored with the
+    embedding pipeline, and only the most promising ones are re-scored by the LLM.
+
+    Expects:
+        - 'resumes': one or more PDF resume files via multipart form-data.
+        - 'job': job description text via form-data.
+        - 'api_key': API key for accessing the LLM service.
+        - 'top_k' (optional): number of top embedding candidates sent to the LLM (default 5).
+        - 'min_score' (optional): minimum embedding score for a candidate to be sent to the LLM (default 0.3).
+
+    Returns:
+        - Same 'results' / 'lessScore' structure as the other match endpoints, where each resume
+          also has a 'stage' ('embedding' or 'llm') and its 'embeddingScore'. Its 'components' hold the
+          final score as 'cascade' next to the embedding 'skills', 'experience' and 'overall' scores.
+          Within each list, LLM-scored resumes rank ahead of embedding-only ones, since the two scores
+          are on different scales.
+        - 'metrics' with the number of LLM calls made and avoided.
+        - 'duplicates': groups of exact/near-duplicate uploads; only the representative is scored.
+        - 'weights' the scores were combined with; pass them back to /api/rerank as 'baseWeights'.
+  """
+  resume_files = request.files.getlist("resumes")
+  job_text = request.form.get("job", "")
+  api_key = request.form.get("api_key")
+
+  if not resume_files or not job_text:
+    return jsonify({'error': 'Missing file or job description'}), 400
+
+  try:
+    top_k = int(request.form.get("top_k", DEFAULT_TOP_K))
+    min_score = float(request.form.get("min_score", DEFAULT_MIN_SCORE))
+  except ValueError:
+    return jsonify({'error': 'top_k and min_score must be numeric'}), 400
+
+  if top_k < 0 or not math.isfinite(min_score):
+    return jsonify({'error': 'top_k must be >= 0 and min_score must be a finite number'}), 400
+
+  # Parse the job description once for the embedding stage
+  jd_parsed = JobDescriptionParser(job_text).parse_jd_data()
+
+  if 'experience_required' not in jd_parsed:
+    return jsonify({'error': 'Job description parsing failed'}), 500
+
+  resumes, duplicates = extract_unique_resumes(resume_files)
+
+  entries, metrics = run_cascade(resumes, job_text, jd_parsed, api_key, top_k, min_score,
+                                 score_cache=score_cache)
+  app.logger.info(f"Cascade: {metrics['llmCalls']} LLM calls, {metrics['llmCallsAvoided']} avoided")
+
+  results, lessScore = rank_entries(entries, CASCADE_WEIGHTS, DEFAULT_THRESHOLD)
+
+  return jsonify({"weights": CASCADE_WEIGHTS,
+                  "results": results,
+                  "lessScore": lessScore,
+                  "metrics": metrics,
+                  "duplicates": duplicates})
+
+
+@app.route('/api/metrics')
+def metrics():
+  """
+    Returns cumulative cascade counters for this worker (runs, resumes, LLM calls made/avoided).
+  """
+  return jsonify({"cascade": get_cascade_metrics()})
+
+
+def parse_scores(mapping):
+  """
+    Validates a JSON object of component name -> number (weights or component scores).
+
+    Returns:
+        dict: Component name -> float.
+
+    Raises:
+        ValueError: If mapping is not an object or a value is not a finite number.
+  """
+  if not isinstance(mapping, dict):
+    raise ValueError("expected an object of component name -> number")
+
+  scores = {}
+  for name, value in mapping.items():
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+      raise ValueError(f"'{name}' must be a finite number")
+    scores[name] = float(value)
+  return scores
+
+
+@app.route('/api/rerank', methods=['POST'])
+def rerank():
+  """
+    API endpoint to re-rank already scored resumes with new weights and/or threshold.
+
+    Nothing is kept on the server between requests: the client sends back the scored resumes,
+    so any worker or instance can serve the request.
+
+    Expects (JSON body):
+        - 'entries': the resumes to re-rank, i.e. the items of 'results' and 'lessScore' returned
+          by a match endpoint. Each must contain its 'components' scores; other fields are passed through.
+        - 'baseWeights': the 'weights' returned by the match endpoint.
+        - 'weights' (optional): component name -> weight, e.g. {"skills": 0.6, "experience": 0.2, "overall": 0.2}.
+          Components that are left out keep their base weight.
+          For /api/match_cascade results the components are 'cascade' (the final LLM or embedding
+          score) plus the embedding 'skills', 'experience' and 'overall'. Re-ranking can change their
+          weights and the threshold, but not which resumes were sent to the LLM; LLM-scored resumes
+          rank first only while 'cascade' has a non-zero weight.
+        - 'threshold' (optional): cutoff between 'results' and 'lessScore'. Defaults to 0.5.
+
+    Returns:
+        - The same 'results' / 'lessScore' structure as the match endpoints, computed from the
+          component scores (no PDF parsing or model calls), plus the 'weights' and 'threshold' used.
+  """
+  payload = request.get_json(silent=True)
+  if not isinstance(payload, dict):
+    return jsonify({'error': 'Request body must be a JSON object'}), 400
+
+  entries = payload.get("entries")
+  if not isinstance(entries, list) or not all(isinstance(entry, dict) for entry in entries):
+    return jsonify({'error': "'entries' must be a list of scored resumes"}), 400
+
+  try:
+    base_weights = parse_scores(payload.get("baseWeights"))
+    new_weights = parse_scores(payload.get("weights") or {})
+    entries = [{**entry, "components": parse_scores(entry.get("components"))} for entry in entries]
+  except ValueError as e:
+    return jsonify({'error': f"Invalid weights or component scores: {e}"}), 400
+
+  threshold = payload.get("threshold", DEFAULT_THRESHOLD)
+  if isinstance(threshold, bool) or not isinstance(threshold, (int, float)) or not math.isfinite(threshold):
+    return jsonify({'error': 'Threshold must be a finite number'}), 400
+
+  unknown = set(new_weights) - set(base_weights)
+  if unknown:
+    return jsonify({'error': f"Unknown score components: {', '.join(sorted(unknown))}"}), 400
+
+  # Merge partial weights over the base ones so omitted components keep their weight
+  weights = {**base_weights, **new_weights}
+
+  results, lessScore = rank_entries(entries, weights, threshold)
+
+  return jsonify({"weights": weights,
+                  "threshold": threshold,
+                  "results": results,
                   "lessScore": lessScore})
 
 
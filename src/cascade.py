@@ -0,0 +1,158 @@
+import json
+import threading
+from src.resume_parser import ResumeParser
+from src.similarity_match import SimilarityMatch, DEFAULT_WEIGHTS
+from src.ranking import combine_scores
+from src.llm_matcher import score_resume_with_llm
+
+# Default number of stage-one candidates forwarded to the LLM
+DEFAULT_TOP_K = 5
+
+# Default minimum embedding score a candidate needs to be forwarded to the LLM
+DEFAULT_MIN_SCORE = 0.3
+
+# Process-wide counters for cascade runs, exposed through /api/metrics
+_metrics = {"runs": 0, "resumes": 0, "llm_calls": 0, "llm_calls_avoided": 0, "llm_failures": 0}
+_metrics_lock = threading.Lock()
+
+
+def get_cascade_metrics():
+    """
+    Returns a snapshot of the cumulative cascade counters for this process.
+    """
+    with _metrics_lock:
+        return dict(_metrics)
+
+
+def llm_score_and_name(resume_text, job_text, api_key, llm_scorer=score_resume_with_llm):
+    """
+    Scores a resume with the LLM and parses its JSON response.
+
+    Returns:
+        tuple: (score as float, candidate name or None)
+    """
+    response = json.loads(llm_scorer(resume_text, job_text, api_key))
+    return float(response["score"]), response.get("Candidate Name")
+
+
+def embedding_stage(resumes, jd_parsed, job_text=None, score_cache=None):
+    """
+    Stage one: scores every resume with the ResumeParser + SimilarityMatch pipeline.
+
+    Args:
+        resumes (list of tuple): (filename, resume_text) pairs.
+        jd_parsed (dict): Output of JobDescriptionParser.parse_jd_data().
+        job_text (str, optional): Raw job description text, used as part of the score_cache key.
+        score_cache (ScoreCache, optional): Scores from earlier uploads; resumes found in it are not re-scored.
+
+    Returns:
+        list of dict: One dict per successfully scored resume with 'filename', 'candidateName',
+            'resume_text', 'components' and 'embeddingScore'.
+    """
+    scored = []
+    for filename, resume_text in resumes:
+        cached = score_cache.get(resume_text, job_text) if score_cache is not None else None
+        if cached is not None:
+            name, components = cached["candidateName"], cached["components"]
+        else:
+            try:
+                resume_parsed = ResumeParser(resume_text).parse(jd_parsed['experience_required'])
+                components = SimilarityMatch(resume_parsed, jd_parsed).component_scores()
+            except Exception as e:
+                print(f"Error processing {filename}: {e}")
+                continue
+
+            name = resume_parsed['name']
+            if score_cache is not None:
+                score_cache.put(resume_text, job_text, name, components)
+
+        scored.append({
+            "filename": filename,
+            "candidateName": name,
+            "resume_text": resume_text,
+            "components": components,
+            "embeddingScore": combine_scores(components, DEFAULT_WEIGHTS)
+        })
+    return scored
+
+
+def select_for_llm(scored, top_k=DEFAULT_TOP_K, min_score=DEFAULT_MIN_SCORE):
+    """
+    Picks which stage-one candidates go on to the LLM: the top_k by embedding score,
+    restricted to those scoring at least min_score. Either limit may be None to disable it.
+
+    Returns:
+        set: Filenames selected for stage two.
+
+    Raises:
+        ValueError: if top_k is negative.
+    """
+    if top_k is not None and top_k < 0:
+        raise ValueError("top_k must be >= 0")
+
+    ranked = sorted(scored, key=lambda x: x["embeddingScore"], reverse=True)
+    if min_score is not None:
+        ranked = [entry for entry in ranked if entry["embeddingScore"] >= min_score]
+    if top_k is not None:
+        ranked = ranked[:top_k]
+    return {entry["filename"] for entry in ranked}
+
+
+def run_cascade(resumes, job_text, jd_parsed, api_key, top_k=DEFAULT_TOP_K, min_score=DEFAULT_MIN_SCORE,
+                llm_scorer=score_resume_with_llm, score_cache=None):
+    """
+    Two-stage ranking: cheap embedding scoring for every resume (reusing score_cache hits),
+    LLM scoring only for the candidates picked by select_for_llm.
+
+    Returns:
+        tuple: (entries, metrics) where each entry has 'filename', 'candidateName', 'stage'
+            ('embedding' or 'llm'), 'embeddingScore' and a single 'cascade' component holding
+            the final score, and metrics counts the LLM calls made and avoided. LLM and embedding
+            scores are on different scales; rank_entries orders LLM-scored entries first.
+    """
+    scored = embedding_stage(resumes, jd_parsed, job_text, score_cache)
+    selected = select_for_llm(scored, top_k, min_score)
+
+    entries = []
+    llm_calls = 0
+    llm_failures = 0
+    for candidate in scored:
+        score = candidate["embeddingScore"]
+        name = candidate["candidateName"]
+        stage = "embedding"
+
+        if candidate["filename"] in selected:
+            llm_calls += 1
+            try:
+                score, llm_name = llm_score_and_name(candidate["resume_text"], job_text, api_key, llm_scorer)
+                name = llm_name or name
+                stage = "llm"
+            except Exception as e:
+                # Keep the stage-one score if the LLM call or its response fails
+                llm_failures += 1
+                print(f"LLM scoring failed for {candidate['filename']}: {e}")
+
+        entries.append({
+            "filename": candidate["filename"],
+            "candidateName": name,
+            "stage": stage,
+            "embeddingScore": round(candidate["embeddingScore"], 4),
+            # Keep the embedding components so /api/rerank can weight them alongside the cascade score
+            "components": {"cascade": score, **candidate["components"]}
+        })
+
+    metrics = {
+        "resumes": len(scored),
+        "llmCalls": llm_calls,
+        "llmCallsAvoided": len(scored) - llm_calls,
+        "llmFailures": llm_failures
+    }
+
+    with _metrics_lock:
+        _metrics["runs"] += 1
+        _metrics["resumes"] += metrics["resumes"]
+        _metrics["llm_calls"] += metrics["llmCalls"]
+        _metrics["llm_calls_avoided"] += metrics["llmCallsAvoided"]
+        _metrics["llm_failures"] += metrics["llmFailures"]
+
+    return entries, metrics
@@ -0,0 +1,262 @@
+import hashlib
+import re
+import threading
+import zlib
+from collections import OrderedDict, defaultdict
+import numpy as np
+from src.patterns import EMAIL_REG, PHONE_REG
+
+# Number of MinHash permutations per signature
+NUM_PERM = 128
+
+# LSH banding: NUM_PERM = BANDS * ROWS. With 32 bands of 4 rows, pairs with Jaccard
+# similarity above ~0.42 become candidates, which are then verified against SIMILARITY_THRESHOLD
+BANDS = 32
+
+# Number of consecutive words per shingle
+SHINGLE_SIZE = 3
+
+# Minimum estimated Jaccard similarity for two resumes to be treated as near-duplicates
+SIMILARITY_THRESHOLD = 0.75
+
+# Texts with fewer shingles than this (e.g. scanned or image-only PDFs with no extracted text)
+# carry too little content to compare and are never treated as duplicates
+MIN_SHINGLES = 20
+
+# Mersenne prime used for the universal hash family (a * x + b) mod p
+_PRIME = (1 << 31) - 1
+
+
+def normalize_text(text):
+    """
+    Normalizes resume text so formatting-only differences (case, punctuation,
+    whitespace, re-exported line breaks) do not affect hashing.
+    """
+    text = text.lower()
+    text = re.sub(r'[^a-z0-9@.+]+', ' ', text)
+    return ' '.join(text.split())
+
+
+def content_hash(normalized_text):
+    """
+    Returns the SHA-256 hex digest of the normalized text, used for exact duplicate detection.
+    """
+    return hashlib.sha256(normalized_text.encode('utf8')).hexdigest()
+
+
+def shingle_ids(normalized_text, k=SHINGLE_SIZE):
+    """
+    Hashes every k-word shingle of the text to a 32-bit integer.
+
+    Returns:
+        numpy.ndarray: Unique shingle ids (uint64). Texts shorter than k words yield a single shingle.
+    """
+    words = normalized_text.split()
+    if len(words) < k:
+        shingles = {' '.join(words)}
+    else:
+        shingles = {' '.join(words[i:i + k]) for i in range(len(words) - k + 1)}
+    return np.fromiter((zlib.crc32(s.encode('utf8')) for s in shingles), dtype=np.uint64, count=len(shingles))
+
+
+def extract_contacts(text):
+    """
+    Extracts the email addresses and phone numbers (digits only) found in the raw resume text.
+
+    Returns:
+        tuple: (set of emails, set of phone numbers)
+    """
+    emails = set(re.findall(EMAIL_REG, text.lower()))
+    phones = {re.sub(r'\D', '', phone) for phone in re.findall(PHONE_REG, text)}
+    return emails, phones
+
+
+def contacts_conflict(contacts_a, contacts_b):
+    """
+    Two resumes belong to different candidates if both list emails (or both list phone numbers)
+    and they have none in common.
+    """
+    for values_a, values_b in zip(contacts_a, contacts_b):
+        if values_a and values_b and not values_a & values_b:
+            return True
+    return False
+
+
+class MinHasher:
+    """
+    Computes MinHash signatures with a fixed family of NUM_PERM universal hash functions.
+    """
+
+    def __init__(self, num_perm=NUM_PERM, seed=1):
+        rng = np.random.RandomState(seed)
+        self.a = rng.randint(1, _PRIME, size=num_perm).astype(np.uint64)
+        self.b = rng.randint(0, _PRIME, size=num_perm).astype(np.uint64)
+
+    def signature(self, ids):
+        """
+        Returns the MinHash signature (uint64 array of length num_perm) for a set of shingle ids.
+        """
+        ids = ids % _PRIME
+        # (num_perm, num_shingles) matrix of permuted ids; products stay below 2**62
+        hashed = (self.a[:, None] * ids[None, :] + self.b[:, None]) % _PRIME
+        return hashed.min(axis=1)
+
+
+class _UnionFind:
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, i):
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i, j):
+        root_i, root_j = self.find(i), self.find(j)
+        # Keep the earliest upload as the root so it becomes the cluster representative
+        if root_i != root_j:
+            self.parent[max(root_i, root_j)] = min(root_i, root_j)
+
+
+class DuplicateDetector:
+    """
+    Clusters exact and near-duplicate resumes within a single batch.
+
+    Nothing is kept between calls, so one upload can never be matched against, or reveal
+    the filenames of, another user's upload.
+    """
+
+    def __init__(self, num_perm=NUM_PERM, bands=BANDS, threshold=SIMILARITY_THRESHOLD, min_shingles=MIN_SHINGLES):
+        self.hasher = MinHasher(num_perm)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.min_shingles = min_shingles
+
+    def _band_keys(self, signature):
+        return [(band, signature[band * self.rows:(band + 1) * self.rows].tobytes()) for band in range(self.bands)]
+
+    def _similar(self, sig_a, sig_b):
+        return float(np.mean(sig_a == sig_b)) >= self.threshold
+
+    def group(self, resumes):
+        """
+        Clusters a batch of resumes into exact and near-duplicate groups.
+
+        Args:
+            resumes (list of tuple): (filename, resume_text) pairs, in upload order.
+
+        Returns:
+            tuple: (representatives, groups)
+                - representatives: the (filename, resume_text) pairs to score, one per cluster.
+                - groups: one dict per cluster with more than one member, containing
+                  'representative', 'duplicates' and 'exact' (all copies are identical after normalization).
+        """
+        hashes = []
+        signatures = []
+        union_find = _UnionFind(len(resumes))
+        first_by_hash = {}
+        buckets = defaultdict(list)
+
+        # Contact details of each cluster, keyed by its root, so near-duplicates from
+        # different candidates (e.g. the same template) are never merged
+        cluster_contacts = {}
+
+        for i, (filename, text) in enumerate(resumes):
+            normalized = normalize_text(text)
+            digest = content_hash(normalized)
+            hashes.append(digest)
+            signatures.append(None)
+
+            ids = shingle_ids(normalized)
+            # Too little text to tell candidates apart: always score it on its own
+            if len(ids) < self.min_shingles:
+                continue
+
+            # Exact duplicates skip shingling entirely
+            if digest in first_by_hash:
+                union_find.union(first_by_hash[digest], i)
+                continue
+            first_by_hash[digest] = i
+
+            signature = self.hasher.signature(ids)
+            signatures[i] = signature
+            cluster_contacts[i] = extract_contacts(text)
+
+            candidates = set()
+            for key in self._band_keys(signature):
+                candidates.update(buckets[key])
+                buckets[key].append(i)
+
+            for j in sorted(candidates):
+                root_i, root_j = union_find.find(i), union_find.find(j)
+                if root_i == root_j or not self._similar(signature, signatures[j]):
+                    continue
+                if contacts_conflict(cluster_contacts[root_i], cluster_contacts[root_j]):
+                    continue
+
+                union_find.union(i, j)
+                merged = tuple(a | b for a, b in zip(cluster_contacts[root_i], cluster_contacts[root_j]))
+                cluster_contacts[union_find.find(i)] = merged
+
+        clusters = OrderedDict()
+        for i in range(len(resumes)):
+            clusters.setdefault(union_find.find(i), []).append(i)
+
+        representatives = []
+        groups = []
+        for root, members in clusters.items():
+            representatives.append(resumes[root])
+
+            if len(members) > 1:
+                groups.append({
+                    "representative": resumes[root][0],
+                    "duplicates": [resumes[i][0] for i in members[1:]],
+                    "exact": len({hashes[i] for i in members}) == 1
+                })
+
+        return representatives, groups
+
+
+class ScoreCache:
+    """
+    Bounded, in-memory cache of pipeline scores across uploads, keyed by the SHA-256 of the
+    resume text and of the job description text.
+
+    Only the scores derived from the text itself are stored (never filenames or anything else
+    about the upload), so a resume scored in one batch is not re-parsed or re-encoded when the
+    same text is scored against the same job description in a later batch.
+    """
+
+    def __init__(self, max_entries=4096):
+        self.max_entries = max_entries
+        self._scores = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(resume_text, job_text):
+        return (hashlib.sha256(resume_text.encode('utf8')).hexdigest(),
+                hashlib.sha256(job_text.encode('utf8')).hexdigest())
+
+    def get(self, resume_text, job_text):
+        """
+        Returns the cached dict ('candidateName', 'components') or None on a miss.
+        """
+        key = self._key(resume_text, job_text)
+        with self._lock:
+            cached = self._scores.get(key)
+            if cached is not None:
+                self._scores.move_to_end(key)
+            return cached
+
+    def put(self, resume_text, job_text, candidate_name, components):
+        """
+        Caches the scores for a resume text / job description pair, evicting the least recently used.
+        """
+        key = self._key(resume_text, job_text)
+        with self._lock:
+            self._scores[key] = {"candidateName": candidate_name, "components": dict(components)}
+            self._scores.move_to_end(key)
+            while len(self._scores) > self.max_entries:
+                self._scores.popitem(last=False)
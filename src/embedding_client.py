@@ -0,0 +1,135 @@
+import json
+import socket
+import struct
+import threading
+import time
+import numpy as np
+
+# Frames are prefixed with their length as a 4-byte big-endian unsigned int
+_HEADER = struct.Struct('>I')
+
+# Retries (with linearly increasing delay) when the sidecar's listen backlog is momentarily full
+CONNECT_RETRIES = 5
+CONNECT_RETRY_DELAY = 0.01
+
+# Upper bound on a single frame, to reject corrupt length prefixes
+MAX_FRAME_BYTES = 256 * 1024 * 1024
+
+
+def send_frame(sock, payload):
+    sock.sendall(_HEADER.pack(len(payload)) + payload)
+
+
+def _recv_exact(sock, size):
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            raise ConnectionError("Connection closed mid-frame")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def recv_frame(sock):
+    """
+    Reads one length-prefixed frame.
+
+    Returns:
+        bytes or None: The frame payload, or None if the peer closed the connection cleanly.
+    """
+    header = sock.recv(_HEADER.size, socket.MSG_WAITALL)
+    if not header:
+        return None
+    if len(header) < _HEADER.size:
+        header += _recv_exact(sock, _HEADER.size - len(header))
+
+    (size,) = _HEADER.unpack(header)
+    if size > MAX_FRAME_BYTES:
+        raise ValueError(f"Frame of {size} bytes exceeds the {MAX_FRAME_BYTES} byte limit")
+    return _recv_exact(sock, size)
+
+
+class EmbeddingClient:
+    """
+    Client for the embedding sidecar (src/embedding_server.py) over a UNIX socket.
+
+    Each thread keeps its own connection open and reuses it across encode calls, so a
+    client can be shared between threads.
+    """
+
+    def __init__(self, socket_path, timeout=30.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connect(self):
+        for attempt in range(CONNECT_RETRIES + 1):
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.socket_path)
+                return sock
+            except BlockingIOError:
+                # EAGAIN: the listen backlog is full while the sidecar accepts other workers
+                sock.close()
+                if attempt == CONNECT_RETRIES:
+                    raise
+                time.sleep(CONNECT_RETRY_DELAY * (attempt + 1))
+            except BaseException:
+                sock.close()
+                raise
+
+    def _close(self):
+        sock = getattr(self._local, 'sock', None)
+        self._local.sock = None
+        if sock is not None:
+            sock.close()
+
+    def _request(self, sock, texts):
+        send_frame(sock, json.dumps({"texts": texts}).encode('utf8'))
+
+        header = recv_frame(sock)
+        if header is None:
+            raise ConnectionError("Embedding sidecar closed the connection")
+        header = json.loads(header)
+        if "error" in header:
+            raise RuntimeError(f"Embedding sidecar error: {header['error']}")
+
+        data = recv_frame(sock)
+        if data is None:
+            raise ConnectionError("Embedding sidecar closed the connection")
+        return np.frombuffer(data, dtype=np.float32).reshape(header["shape"])
+
+    def encode(self, texts):
+        """
+        Encodes a list of texts on the sidecar.
+
+        Returns:
+            numpy.ndarray: float32 matrix with one (unnormalized) embedding per text.
+
+        Raises:
+            OSError, ConnectionError, ValueError, RuntimeError: if the sidecar is unreachable or fails.
+        """
+        sock = getattr(self._local, 'sock', None)
+        reused = sock is not None
+        if not reused:
+            sock = self._local.sock = self._connect()
+
+        try:
+            return self._request(sock, texts)
+        except RuntimeError:
+            # The sidecar reported an error; the connection itself is still usable
+            raise
+        except (OSError, ValueError):
+            self._close()
+            if not reused:
+                raise
+
+        # A reused connection may have gone stale (e.g. the sidecar restarted): retry once on a new one
+        sock = self._local.sock = self._connect()
+        try:
+            return self._request(sock, texts)
+        except (OSError, ValueError):
+            self._close()
+            raise
@@ -0,0 +1,175 @@
+"""
+Local embedding inference sidecar.
+
+Owns a single instance of the sentence embedding model and serves encode requests from
+all app workers over a UNIX socket. Concurrent requests are coalesced into micro-batches:
+a batch is encoded as soon as it holds max_batch_size texts or max_wait_ms have passed
+since its first request arrived.
+
+Usage:
+    python -m src.embedding_server --socket /tmp/resume-embedding.sock
+    EMBEDDING_SOCKET=/tmp/resume-embedding.sock gunicorn -b :8080 main:app
+"""
+import argparse
+import json
+import logging
+import os
+import queue
+import socketserver
+import threading
+import time
+import numpy as np
+from src.embedding_client import send_frame, recv_frame
+from src.embedding_utils import get_model, DEFAULT_SOCKET_PATH
+
+logger = logging.getLogger(__name__)
+
+# Default micro-batching policy
+DEFAULT_MAX_BATCH_SIZE = 64
+DEFAULT_MAX_WAIT_MS = 5
+
+
+class _Pending:
+    def __init__(self, texts):
+        self.texts = texts
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class MicroBatcher:
+    """
+    Collects encode requests from many threads and runs them through the model in batches.
+    """
+
+    def __init__(self, encode_fn, max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_wait_ms=DEFAULT_MAX_WAIT_MS):
+        self.encode_fn = encode_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, texts):
+        """
+        Blocks until the texts have been encoded as part of a batch.
+
+        Returns:
+            numpy.ndarray: float32 matrix with one embedding per text.
+        """
+        pending = _Pending(texts)
+        self._queue.put(pending)
+        pending.done.wait()
+        if pending.error is not None:
+            raise pending.error
+        return pending.result
+
+    def _collect(self):
+        # Wait for the first request, then keep collecting until the batch is full or the wait expires
+        batch = [self._queue.get()]
+        size = len(batch[0].texts)
+        deadline = time.monotonic() + self.max_wait
+
+        while size < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                pending = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(pending)
+            size += len(pending.texts)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            texts = [text for pending in batch for text in pending.texts]
+
+            try:
+                vectors = np.asarray(self.encode_fn(texts), dtype=np.float32)
+            except Exception as e:
+                for pending in batch:
+                    pending.error = e
+                    pending.done.set()
+                continue
+
+            logger.debug("Encoded batch of %d texts from %d requests", len(texts), len(batch))
+
+            # Hand each request back its own slice of the batch
+            offset = 0
+            for pending in batch:
+                pending.result = vectors[offset:offset + len(pending.texts)]
+                offset += len(pending.texts)
+                pending.done.set()
+
+
+class _EncodeHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        # A connection may send several requests; stop when the client closes it
+        while True:
+            try:
+                frame = recv_frame(self.request)
+            except (ConnectionError, ValueError, OSError) as e:
+                logger.warning("Dropping connection: %s", e)
+                return
+            if frame is None:
+                return
+
+            try:
+                texts = json.loads(frame)["texts"]
+                if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+                    raise ValueError("'texts' must be a list of strings")
+                vectors = self.server.batcher.submit(texts) if texts else np.zeros((0, 0), dtype=np.float32)
+            except Exception as e:
+                send_frame(self.request, json.dumps({"error": str(e)}).encode('utf8'))
+                continue
+
+            send_frame(self.request, json.dumps({"shape": list(vectors.shape)}).encode('utf8'))
+            send_frame(self.request, np.ascontiguousarray(vectors).tobytes())
+
+
+class EmbeddingServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    # Every app worker may connect at once; socketserver's default backlog of 5 would
+    # make extra connects fail with EAGAIN and push workers onto in-process encoding
+    request_queue_size = 128
+
+    def __init__(self, socket_path, batcher):
+        # Remove a stale socket left behind by a previous run
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        self.batcher = batcher
+        super().__init__(socket_path, _EncodeHandler)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--socket", default=os.environ.get("EMBEDDING_SOCKET", DEFAULT_SOCKET_PATH))
+    arg_parser.add_argument("--max-batch-size", type=int, default=DEFAULT_MAX_BATCH_SIZE)
+    arg_parser.add_argument("--max-wait-ms", type=float, default=DEFAULT_MAX_WAIT_MS)
+    args = arg_parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    model = get_model()
+    batcher = MicroBatcher(
+        lambda texts: model.encode(texts, batch_size=args.max_batch_size),
+        args.max_batch_size,
+        args.max_wait_ms
+    )
+
+    with EmbeddingServer(args.socket, batcher) as server:
+        logger.info("Embedding sidecar listening on %s", args.socket)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.unlink(args.socket)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+import os
+import threading
+import time
+from functools import lru_cache
+import numpy as np
+from src.embedding_client import EmbeddingClient
+
+# Sentence embedding model shared by the parsers and matchers
+MODEL_NAME = 'all-MiniLM-L6-v2'
+
+# Socket used by the optional embedding sidecar (src/embedding_server.py)
+DEFAULT_SOCKET_PATH = '/tmp/resume-embedding.sock'
+
+# After the sidecar fails, encode in-process for this long before trying it again
+SIDECAR_RETRY_SECONDS = 30
+
+# The sidecar is only used when EMBEDDING_SOCKET is set
+_socket_path = os.environ.get('EMBEDDING_SOCKET')
+_client = EmbeddingClient(_socket_path) if _socket_path else None
+_sidecar_down_until = 0.0
+_sidecar_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def get_model():
+    """
+    Loads the sentence embedding model once per process and returns the shared instance.
+    """
+    # Imported here so workers that encode on the sidecar never load torch
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(MODEL_NAME)
+
+
+def encode(texts, normalize_embeddings=False):
+    """
+    Encodes a list of texts, on the embedding sidecar when it is configured and reachable,
+    otherwise with the in-process model.
+
+    Returns:
+        numpy.ndarray: float32 matrix with one embedding per text.
+    """
+    global _sidecar_down_until
+
+    texts = list(texts)
+    vectors = None
+
+    if _client is not None and time.monotonic() >= _sidecar_down_until:
+        try:
+            vectors = _client.encode(texts)
+        except Exception as e:
+            print(f"Embedding sidecar unavailable, encoding in-process: {e}")
+            with _sidecar_lock:
+                _sidecar_down_until = time.monotonic() + SIDECAR_RETRY_SECONDS
+
+    if vectors is None:
+        vectors = np.asarray(get_model().encode(texts), dtype=np.float32)
+
+    if normalize_embeddings and len(vectors):
+        vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+    return vectors
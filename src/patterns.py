@@ -0,0 +1,7 @@
+import re
+
+# Regular expression to match most common email formats
+EMAIL_REG = re.compile(r'[a-z0-9\.\-+_]+@[a-z0-9\.\-+_]+\.[a-z]+')
+
+# Regular expression to match international and formatted phone numbers
+PHONE_REG = re.compile(r'[\+\(]?[1-9][0-9 .\-\(\)]{8,}[0-9]')
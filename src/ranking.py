@@ -0,0 +1,55 @@
+# Default cutoff between "results" and "lessScore" in match responses
+DEFAULT_THRESHOLD = 0.5
+
+
+def combine_scores(components, weights):
+    """
+    Combines per-component similarity scores into a single weighted score.
+
+    Args:
+        components (dict): Component name -> score (e.g. {"skills": 0.7, ...}).
+        weights (dict): Component name -> weight. Components without a weight are ignored.
+
+    Returns:
+        float: The weighted sum of the component scores.
+    """
+    return sum(weight * components.get(name, 0.0) for name, weight in weights.items())
+
+
+def rank_entries(entries, weights, threshold=DEFAULT_THRESHOLD):
+    """
+    Scores and splits stored entries into above/below threshold lists.
+
+    Args:
+        entries (list of dict): Each dict contains 'filename', 'candidateName' and 'components',
+            plus any extra fields to pass through to the response.
+        weights (dict): Weights passed to combine_scores.
+        threshold (float): Entries scoring >= threshold go into 'results', the rest into 'lessScore'.
+
+    Returns:
+        tuple: (results, lessScore), both sorted by score in descending order. While the 'cascade'
+            component is weighted, entries scored by the LLM stage of a cascade rank as a block ahead
+            of embedding-only entries, because the two scores are not on the same scale.
+    """
+    llm_first = bool(weights.get("cascade"))
+    results = []
+    lessScore = []
+
+    for entry in entries:
+        score = combine_scores(entry["components"], weights)
+        # Carry over any extra fields (e.g. 'stage') alongside the computed score
+        item = {key: value for key, value in entry.items() if key != "components"}
+        item["score"] = round(score, 2)
+        item["components"] = {name: round(value, 4) for name, value in entry["components"].items()}
+        if score >= threshold:
+            results.append(item)
+        else:
+            lessScore.append(item)
+
+    def rank_key(item):
+        return llm_first and item.get("stage") == "llm", item["score"]
+
+    results = sorted(results, key=rank_key, reverse=True)
+    lessScore = sorted(lessScore, key=rank_key, reverse=True)
+    return results, lessScore
+
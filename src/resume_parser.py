@@ -6,7 +6,8 @@ from datetime import datetime
 import spacy.cli
 from spacy.util import is_package
 import subprocess
-from sentence_transformers import SentenceTransformer, util
+from src.title_index import get_title_index
+from src.patterns import EMAIL_REG, PHONE_REG
 import os
 
 # Check if the spaCy language model "en_core_web_sm" is installed
@@ -42,12 +43,6 @@ patterns = [nlp.make_doc(skill) for skill in patterns]
 # Add skill patterns to the matcher under the label "SKILL"
 matcher.add("SKILL", patterns)
 
-# Regular expression to match most common email formats
-EMAIL_REG = re.compile(r'[a-z0-9\.\-+_]+@[a-z0-9\.\-+_]+\.[a-z]+')
-
-# Regular expression to match international and formatted phone numbers
-PHONE_REG = re.compile(r'[\+\(]?[1-9][0-9 .\-\(\)]{8,}[0-9]')
-
 class ResumeParser:
     def __init__(self, resume_text):
         self.text = resume_text
@@ -234,16 +229,33 @@ class ResumeParser:
         return experience
     
     def extract_relevant_experience(self,resume_experience,jd_experience):
-        model = SentenceTransformer('all-MiniLM-L6-v2')
+        """
+        Keeps the experience entries whose job title is similar to the field required by the job description.
+
+        Job titles are resolved through the precomputed job title index, so known titles and
+        aliases need no model call.
+
+        Returns:
+            list of dict: The relevant experience entries.
+        """
         relevant_experience = []
+
+        # No field or role was found next to the required experience in the job description
+        if jd_experience[1] is None:
+            return relevant_experience
+
+        title_index = get_title_index()
+
+        # Resolve the job description field once rather than for every entry
+        jd_vector = title_index.resolve(jd_experience[1])[1]
+
         for i in resume_experience:
 
             job_title= i['job_title']
 
-            if jd_experience[1] is not None:
-                score = util.cos_sim(model.encode(job_title), model.encode(jd_experience[1]))
+            score = title_index.similarity(job_title, jd_vector)
 
-            if score[0][0] > 0.5:
+            if score > 0.5:
                 relevant_experience.append(i)
 
         return relevant_experience
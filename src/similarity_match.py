@@ -1,14 +1,22 @@
-from sentence_transformers import SentenceTransformer, util
+from src.embedding_utils import encode
+from src.ranking import combine_scores
+
+# Weights used to combine the component scores into the final similarity score
+DEFAULT_WEIGHTS = {"skills": 0.5, "experience": 0.3, "overall": 0.2}
 
 class SimilarityMatch:
         
     def __init__(self, resume_details, job_desc_details):
         self.resume_details = resume_details
         self.job_desc_details = job_desc_details
-    
-    def similarity_check_in_resume_and_job_desc(self):
-        model = SentenceTransformer('all-MiniLM-L6-v2')
-      
+
+    def component_scores(self):
+        """
+        Computes the individual cosine similarity scores between resume and job description.
+
+        Returns:
+            dict: Scores for 'skills', 'experience' and 'overall'.
+        """
         # Combine relevant experience entries into one string
         relevant_experience_entries = self.resume_details.get("relevant_experience", [])
         # print(relevant_experience_entries)
@@ -19,25 +27,38 @@ class SimilarityMatch:
             for entry in relevant_experience_entries
         ])
 
+        # Encode all (resume, job description) text pairs in a single batch
+        pairs = {
+            "skills": (
+                " ".join(self.resume_details.get("skills", [])),
+                " ".join(self.job_desc_details.get("required_skills", []))
+            ),
+
+            "experience": (
+                experience_text,
+                " ".join(self.job_desc_details.get("experience_required", []))
+            ),
+
+            "overall": (
+                self.resume_details.get("resume_text"),
+                self.job_desc_details.get("job_description")
+            )
+        }
+        vectors = encode([text for pair in pairs.values() for text in pair], normalize_embeddings=True)
+
+        # Cosine similarity of each normalized pair
         scores = {
-            "skills": util.pytorch_cos_sim(
-                model.encode(" ".join(self.resume_details.get("skills", [])), convert_to_tensor=True),
-                model.encode(" ".join(self.job_desc_details.get("required_skills", [])), convert_to_tensor=True)
-            ).item(),
-
-            "experience": util.pytorch_cos_sim(
-                model.encode(experience_text, convert_to_tensor=True),
-                model.encode(" ".join(self.job_desc_details.get("experience_required", [])), convert_to_tensor=True)
-            ).item(),
-
-            "overall": util.pytorch_cos_sim(
-                model.encode(self.resume_details.get("resume_text"), convert_to_tensor=True),
-                model.encode(self.job_desc_details.get("job_description"), convert_to_tensor=True)
-            ).item()
+            name: float(vectors[2 * i] @ vectors[2 * i + 1])
+            for i, name in enumerate(pairs)
         }
         # print(scores)
 
-        final_score = 0.5 * scores["skills"] + 0.3 * scores["experience"]  + 0.2 * scores["overall"]
+        return scores
+
+    def similarity_check_in_resume_and_job_desc(self, weights=None):
+        scores = self.component_scores()
+
+        final_score = combine_scores(scores, weights or DEFAULT_WEIGHTS)
 
 
         return final_score
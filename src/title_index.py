@@ -0,0 +1,214 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+import numpy as np
+from src.embedding_utils import encode, MODEL_NAME
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Canonical job titles with their aliases, one JSON object per line
+TAXONOMY_PATH = os.path.join(current_dir, '..', 'data', 'job_titles.jsonl')
+
+# Precomputed, L2-normalized embeddings of the canonical titles (rows in taxonomy order),
+# stored with the digest of the taxonomy and model they were built from
+EMBEDDINGS_PATH = os.path.join(current_dir, '..', 'data', 'job_title_embeddings.npz')
+
+# Fallback location for embeddings built at runtime when data/ is read-only (e.g. App Engine)
+CACHE_DIR = tempfile.gettempdir()
+
+# Minimum cosine similarity for an unknown title to be snapped to its nearest canonical title
+SNAP_THRESHOLD = 0.85
+
+# Abbreviations expanded before alias lookup (e.g. "Sr. Data Engineer" -> "senior data engineer")
+ABBREVIATIONS = {"sr": "senior", "jr": "junior", "mgr": "manager", "eng": "engineer", "dev": "developer"}
+
+
+def normalize_title(title):
+    """
+    Normalizes a job title for alias lookup: lowercase, hyphens/slashes as spaces,
+    punctuation removed (keeping characters used in titles such as 'C#', '.NET', 'UI/UX'),
+    and common abbreviations expanded.
+    """
+    title = title.lower().replace('-', ' ')
+    title = re.sub(r'[^a-z0-9#+./&\s]', ' ', title)
+    words = [ABBREVIATIONS.get(word.strip('.'), word) for word in title.split()]
+    return ' '.join(words)
+
+
+def load_taxonomy(path=TAXONOMY_PATH):
+    """
+    Loads the job title taxonomy.
+
+    Returns:
+        list of dict: Each dict contains 'title' and 'aliases'.
+    """
+    with open(path, 'r', encoding='utf8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def build_embeddings(taxonomy):
+    """
+    Encodes the canonical titles of the taxonomy into an L2-normalized float32 matrix.
+    """
+    titles = [entry['title'] for entry in taxonomy]
+    return encode(titles, normalize_embeddings=True)
+
+
+def taxonomy_digest(taxonomy):
+    """
+    Returns a SHA-256 hex digest of the canonical titles (in order) and the embedding model name,
+    identifying the embedding matrix built from them.
+    """
+    key = json.dumps({"model": MODEL_NAME, "titles": [entry['title'] for entry in taxonomy]})
+    return hashlib.sha256(key.encode('utf8')).hexdigest()
+
+
+def save_embeddings(path, matrix, digest):
+    """
+    Writes the embedding matrix and its taxonomy digest as an .npz file, atomically
+    (temporary file + os.replace) so processes loading it concurrently never see a half-written file.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.npz.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, embeddings=matrix, digest=np.array(digest))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def load_embeddings(path, digest):
+    """
+    Loads an embedding matrix saved by save_embeddings.
+
+    Returns:
+        numpy.ndarray or None: The float32 matrix, or None if the file is missing, unreadable or
+            was built from a different taxonomy or model.
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        with np.load(path) as data:
+            stored_digest = str(data['digest'])
+            matrix = data['embeddings']
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Could not read job title embeddings from {path}: {e}")
+        return None
+
+    if stored_digest != digest:
+        print(f"Job title embeddings in {path} are out of date; run python -m src.title_index")
+        return None
+    return matrix.astype(np.float32)
+
+
+def _cache_path(digest):
+    # Key the runtime cache by the taxonomy digest so edits never reuse a stale matrix
+    return os.path.join(CACHE_DIR, f'job_title_embeddings-{digest[:12]}.npz')
+
+
+class JobTitleIndex:
+    """
+    Resolves job titles to embeddings with as few model calls as possible.
+
+    Titles are looked up by exact or alias match against the taxonomy first, which returns
+    a precomputed embedding. Only on a miss is the title encoded; it is then snapped to the
+    nearest canonical title when similar enough. Misses are cached so repeated titles are
+    encoded once per process.
+    """
+
+    def __init__(self, taxonomy_path=TAXONOMY_PATH, embeddings_path=EMBEDDINGS_PATH, cache_size=4096):
+        taxonomy = load_taxonomy(taxonomy_path)
+        self.titles = [entry['title'] for entry in taxonomy]
+
+        # Map every normalized title and alias to its row in the embedding matrix
+        self.lookup = {}
+        for row, entry in enumerate(taxonomy):
+            for name in [entry['title']] + entry.get('aliases', []):
+                self.lookup.setdefault(normalize_title(name), row)
+
+        self.matrix = self._load_embeddings(taxonomy, embeddings_path)
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _load_embeddings(self, taxonomy, embeddings_path):
+        # Prefer the shipped matrix, then one built at runtime by an earlier process
+        digest = taxonomy_digest(taxonomy)
+        paths = [embeddings_path, _cache_path(digest)]
+        for path in paths:
+            matrix = load_embeddings(path, digest)
+            if matrix is not None:
+                return matrix
+
+        # Last resort: the shipped matrix is missing or stale, so every new instance pays for this
+        print(f"No up-to-date job title embeddings in {embeddings_path}; encoding {len(taxonomy)} titles")
+        matrix = build_embeddings(taxonomy)
+        for path in paths:
+            try:
+                save_embeddings(path, matrix, digest)
+                break
+            except OSError as e:
+                print(f"Could not save job title embeddings to {path}: {e}")
+        return matrix
+
+    def resolve(self, title):
+        """
+        Resolves a job title (or experience field) to a canonical title and an embedding.
+
+        Returns:
+            tuple: (canonical title or None, L2-normalized embedding as a numpy array)
+        """
+        normalized = normalize_title(title)
+
+        row = self.lookup.get(normalized)
+        if row is not None:
+            return self.titles[row], self.matrix[row]
+
+        with self._lock:
+            if normalized in self._cache:
+                self._cache.move_to_end(normalized)
+                return self._cache[normalized]
+
+        # Cache miss: encode the title and search the precomputed matrix
+        vector = encode([title], normalize_embeddings=True)[0]
+        similarities = self.matrix @ vector
+        best = int(np.argmax(similarities))
+        if similarities[best] >= SNAP_THRESHOLD:
+            resolved = (self.titles[best], self.matrix[best])
+        else:
+            resolved = (None, vector)
+
+        with self._lock:
+            self._cache[normalized] = resolved
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return resolved
+
+    def similarity(self, title, other_vector):
+        """
+        Returns the cosine similarity between a job title and an already resolved embedding.
+        """
+        return float(np.dot(self.resolve(title)[1], other_vector))
+
+
+@lru_cache(maxsize=1)
+def get_title_index():
+    """
+    Returns the process-wide JobTitleIndex, loading it on first use.
+    """
+    return JobTitleIndex()
+
+
+if __name__ == '__main__':
+    # Regenerate data/job_title_embeddings.npz after editing data/job_titles.jsonl or changing the model:
+    #   python -m src.title_index
+    taxonomy = load_taxonomy()
+    save_embeddings(EMBEDDINGS_PATH, build_embeddings(taxonomy), taxonomy_digest(taxonomy))
+    print(f"Saved embeddings for {len(taxonomy)} job titles to {os.path.normpath(EMBEDDINGS_PATH)}")